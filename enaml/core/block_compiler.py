@@ -5,7 +5,7 @@
 #
 # The full license is in the file LICENSE, distributed with this software.
 #------------------------------------------------------------------------------
-from atom.api import Typed
+from atom.api import Int, Typed
 
 from . import compiler_common as cmn
 
@@ -17,36 +17,45 @@ class BaseBlockCompiler(cmn.CompilerBase):
     #: The set of local names for the compiler.
     local_names = Typed(set, ())
 
-    #: A mapping of ast node -> compiler node index for the block.
+    #: A mapping of ast node -> compiler node index for the block. The
+    #: auxiliary nodes, such as bindings, map to the index of the
+    #: compiler node for their parent.
     index_map = Typed(dict, ())
 
-    def parent_index(self):
-        """ Get the node index for the parent node.
-
-        Returns
-        -------
-        result : int
-            The compiler node index for the node represented by the
-            current parent ast node.
-
-        """
-        return self.index_map[self.ancestor()]
-
 
 class FirstPassBlockCompiler(BaseBlockCompiler):
     """ The first pass block compiler.
 
     This is a base class for the first pass compilers for the enamldef
-    and template block definitions.
+    and template block definitions. The body items of a block are
+    visited with the compiler node index of their parent.
 
     """
-    #: A mapping of auxiliary ast node -> compiler node index.
-    aux_index_map = Typed(dict, ())
+    #: The number of compiler node indices claimed so far.
+    node_count = Int()
 
-    def visit_ChildDef(self, node):
-        # Claim the index for the compiler node.
-        index = len(self.index_map)
+    def claim_index(self, node):
+        """ Claim the next compiler node index for an ast node.
+
+        Parameters
+        ----------
+        node : ASTNode
+            The ast node which will be represented by a compiler node.
+
+        Returns
+        -------
+        result : int
+            The compiler node index claimed for the node.
+
+        """
+        index = self.node_count
+        self.node_count = index + 1
         self.index_map[node] = index
+        return index
+
+    def visit_ChildDef(self, node, parent):
+        # Claim the index for the compiler node.
+        index = self.claim_index(node)
 
         # Setup the line number for the child def.
         cg = self.code_generator
@@ -56,22 +65,22 @@ class FirstPassBlockCompiler(BaseBlockCompiler):
         cmn.gen_child_def_node(cg, node, self.local_names)
 
         # Store the compiler node in the node list.
+        cg.dup_top()
         cmn.store_node(cg, index)
 
         # Append the compiler node to the parent node.
-        cmn.append_node(cg, self.parent_index(), index)
+        cmn.append_node(cg, parent)
 
         # Visit the body of the child def.
         for item in node.body:
-            self.visit(item)
+            self.visit(item, index)
 
-    def visit_TemplateInst(self, node):
+    def visit_TemplateInst(self, node, parent):
         # No pragmas are supported yet for template inst nodes.
         cmn.warn_pragmas(node, self.filename)
 
         # Claim the index for the compiler node.
-        index = len(self.index_map)
-        self.index_map[node] = index
+        index = self.claim_index(node)
 
         # Setup the line number for the template inst.
         cg = self.code_generator
@@ -81,49 +90,51 @@ class FirstPassBlockCompiler(BaseBlockCompiler):
         cmn.gen_template_inst_node(cg, node, self.local_names)
 
         # Store the compiler node in the node list.
+        cg.dup_top()
         cmn.store_node(cg, index)
 
         # Append the compiler node to the parent node.
-        cmn.append_node(cg, self.parent_index(), index)
+        cmn.append_node(cg, parent)
 
         # Visit the body of the template inst.
         for item in node.body:
-            self.visit(item)
+            self.visit(item, index)
 
-    def visit_TemplateInstBinding(self, node):
+    def visit_TemplateInstBinding(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_Binding(self, node):
+    def visit_Binding(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_ExBinding(self, node):
+    def visit_ExBinding(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_AliasExpr(self, node):
+    def visit_AliasExpr(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_StorageExpr(self, node):
+    def visit_StorageExpr(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_FuncDef(self, node):
+    def visit_FuncDef(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
-    def visit_AsyncFuncDef(self, node):
+    def visit_AsyncFuncDef(self, node, parent):
         # Grab the index of the parent node for later use.
-        self.aux_index_map[node] = self.parent_index()
+        self.index_map[node] = parent
 
 
 class SecondPassBlockCompiler(BaseBlockCompiler):
     """ The second pass block compiler.
 
     This is a base class for the second pass compilers for the enamldef
-    and template block definitions.
+    and template block definitions. The index map of the first pass
+    maps the auxiliary nodes directly to the index of their parent.
 
     """
     def visit_ChildDef(self, node):
@@ -148,31 +159,31 @@ class SecondPassBlockCompiler(BaseBlockCompiler):
     def visit_TemplateInstBinding(self, node):
         # Generate the code for the template inst binding.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_template_inst_binding(cg, node, index)
 
     def visit_Binding(self, node):
         # Generate the code for the operator binding.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_operator_binding(cg, node.expr, index, node.name)
 
     def visit_ExBinding(self, node):
         # Generate the code for the operator binding.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_operator_binding(cg, node.expr, index, node.chain)
 
     def visit_AliasExpr(self, node):
         # Generate the code for the alias expression.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_alias_expr(cg, node, index)
 
     def visit_StorageExpr(self, node):
         # Generate the code for the storage expression.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_storage_expr(cg, node, index, self.local_names)
         if node.expr is not None:
             cmn.gen_operator_binding(cg, node.expr, index, node.name)
@@ -180,7 +191,7 @@ class SecondPassBlockCompiler(BaseBlockCompiler):
     def visit_FuncDef(self, node):
         # Generate the code for the function declaration.
         cg = self.code_generator
-        index = self.parent_index()
+        index = self.index_map[node]
         cmn.gen_decl_funcdef(cg, node, index)
 
     def visit_AsyncFuncDef(self, node):
@@ -39,6 +39,46 @@ class _ReturnNoneIdentifier(ast.NodeVisitor):
         pass
 
 
+def _rewrite_to_fast_locals(code_ops, local_names):
+    """ Rewrite the *_NAME opcodes of a list of code ops in place.
+
+    See CodeGenerator.rewrite_to_fast_locals for the rewriting rules.
+
+    Returns
+    -------
+    result : list
+        The list of names which must be provided as arguments.
+
+    """
+    arg_names = []
+    add_arg = arg_names.append
+    stored_names = set()
+    add_stored = stored_names.add
+    for instr in code_ops:
+        if instr.name == "STORE_NAME":
+            add_stored(instr.arg)
+            instr.name = "STORE_FAST"
+    for instr in code_ops:
+        i_name = instr.name
+        if i_name == "LOAD_NAME":
+            i_arg = instr.arg
+            if i_arg in local_names:
+                op = "LOAD_FAST"
+                add_arg(i_arg)
+            elif i_arg in stored_names:
+                op = "LOAD_FAST"
+            else:
+                op = "LOAD_GLOBAL"
+            instr.name = op
+        elif i_name == "DELETE_NAME":
+            if instr.arg in stored_names:
+                op = "DELETE_FAST"
+            else:
+                op = "DELETE_GLOBAL"
+            instr.name = op
+    return arg_names
+
+
 class CodeGenerator(Atom):
     """ A class for generating bytecode operations.
 
@@ -262,6 +302,22 @@ class CodeGenerator(Atom):
             bc.Instr("BUILD_MAP", n),                   # TOS -> map
         )
 
+    def build_const_key_map(self, keys):
+        """ Build a map from the values on the TOS and constant keys.
+
+        Parameters
+        ----------
+        keys : tuple
+            The constant keys of the map, in the order in which the
+            matching values were pushed onto the stack.
+
+        """
+        keys = tuple(keys)
+        self.code_ops.extend([                          # TOS -> val_1 -> ... -> val_n
+            bc.Instr("LOAD_CONST", keys),               # TOS -> val_1 -> ... -> val_n -> keys
+            bc.Instr("BUILD_CONST_KEY_MAP", len(keys)), # TOS -> map
+        ])
+
     def build_tuple(self, n=0):
         """ Build a tuple from items on the TOS.
 
@@ -500,14 +556,20 @@ class CodeGenerator(Atom):
 
         self.code_ops.extend(bc_code)
 
-    def insert_python_expr(self, pydata, trim=True):
+    def insert_python_expr(self, pydata, trim=True, local_names=None):
         """ Insert the compiled code for a Python Expression ast or string.
 
+        If a set of local names is given, the inserted code is rewritten
+        to load those names from the fast locals and all the other names
+        from the globals, as done by 'rewrite_to_fast_locals'.
+
         """
         code = compile(pydata, self.filename, mode='eval')
         bc_code = bc.Bytecode.from_code(code)
         if trim:  # skip ReturnValue
             bc_code = bc_code[:-1]
+        if local_names is not None:
+            _rewrite_to_fast_locals(bc_code, local_names)
         self.code_ops.extend(bc_code)
 
     def rewrite_to_fast_locals(self, local_names):
@@ -530,31 +592,7 @@ class CodeGenerator(Atom):
             The list of names which must be provided as arguments.
 
         """
-        arg_names = []
-        stored_names = set()
-        code_ops = self.code_ops
-        for idx, instr in enumerate(code_ops):
-            if instr.name == "STORE_NAME":
-                stored_names.add(instr.arg)
-                instr.name = "STORE_FAST"
-        for idx, instr in enumerate(code_ops):
-            i_name = instr.name
-            if i_name == "LOAD_NAME":
-                i_arg = instr.arg
-                if i_arg in local_names:
-                    op = "LOAD_FAST"
-                    arg_names.append(i_arg)
-                elif i_arg in stored_names:
-                    op = "LOAD_FAST"
-                else:
-                    op = "LOAD_GLOBAL"
-                instr.name = op
-            elif i_name == "DELETE_NAME":
-                if instr.arg in stored_names:
-                    op = "DELETE_FAST"
-                else:
-                    op = "DELETE_GLOBAL"
-                instr.name = op
+        arg_names = _rewrite_to_fast_locals(self.code_ops, local_names)
         self.args = arg_names
         self.newlocals = True
         return arg_names
@@ -9,6 +9,7 @@
 
 """
 import ast
+from functools import lru_cache
 from types import CodeType
 
 import bytecode as bc
@@ -128,6 +129,31 @@ def should_store_locals(node):
     return False
 
 
+def should_subclass(node):
+    """ Get whether or not a child def should subclass its base type.
+
+    A child def must create its own subclass if it has storage exprs,
+    alias exprs, or declarative function definitions.
+
+    Parameters
+    ----------
+    node : ChildDef
+        The ast node of interest.
+
+    Returns
+    -------
+    result : bool
+        True if a subclass of the child type should be created, False
+        otherwise.
+
+    """
+    types = (StorageExpr, AliasExpr, FuncDef)
+    for item in node.body:
+        if isinstance(item, types):
+            return True
+    return False
+
+
 def count_nodes(node):
     """ Count the number of compiler nodes needed for the template.
 
@@ -233,6 +259,37 @@ def load_helper(cg, name, from_globals=False):
     cg.binary_subscr()
 
 
+def validate_tos(cg, name, consts=()):
+    """ Validate the object on the TOS using a compiler helper.
+
+    The helper is called with the TOS and the given constants, and its
+    return value is discarded so the TOS is left in place. Any error
+    raised by the helper appears to originate from the generated code.
+    The caller should have already invoked the 'fetch_helpers' function
+    for the code generator.
+
+    Parameters
+    ----------
+    cg : CodeGenerator
+        The code generator with which to write the code.
+
+    name : str
+        The name of the compiler helper to call on the TOS.
+
+    consts : tuple, optional
+        Additional constant arguments to pass to the helper.
+
+    """
+    with cg.try_squash_raise():
+        cg.dup_top()                            # obj -> obj
+        load_helper(cg, name)                   # obj -> obj -> helper
+        cg.rot_two()                            # obj -> helper -> obj
+        for const in consts:
+            cg.load_const(const)
+        cg.call_function(len(consts) + 1)       # obj -> retval
+        cg.pop_top()                            # obj
+
+
 def load_name(cg, name, local_names):
     """ Load a name onto the TOS.
 
@@ -341,10 +398,12 @@ def load_node(cg, index):
     cg.binary_subscr()
 
 
-def append_node(cg, parent, index):
+def append_node(cg, parent):
     """ Append the node on the TOS as a child of the specified node.
 
-    The caller should ensure that NODE_LIST exists in fast locals.
+    The node is consumed from the TOS, which avoids reloading it from
+    the node list. The caller should ensure that NODE_LIST exists in
+    fast locals.
 
     Parameters
     ----------
@@ -354,15 +413,12 @@ def append_node(cg, parent, index):
     parent : int
         The index of the parent node in the node list.
 
-    index : int
-        The index of the target node in the node list.
-
     """
-    load_node(cg, parent)
+    load_node(cg, parent)                       # node -> parent
     cg.load_attr('children')
-    cg.load_attr('append')
-    load_node(cg, index)
-    cg.call_function(1)
+    cg.load_attr('append')                      # node -> append
+    cg.rot_two()                                # append -> node
+    cg.call_function(1)                         # retval
     cg.pop_top()
 
 
@@ -392,10 +448,7 @@ def safe_eval_ast(cg, node, name, lineno, local_names):
         The set of fast local names available to the code object.
 
     """
-    expr_cg = CodeGenerator()
-    expr_cg.insert_python_expr(node)
-    expr_cg.rewrite_to_fast_locals(local_names)
-    cg.code_ops.extend(expr_cg.code_ops)
+    cg.insert_python_expr(node, local_names=local_names)
 
 
 def analyse_globals_and_func_defs(pyast):
@@ -425,7 +478,7 @@ def rewrite_globals_access(code, global_vars):
     made global via the 'global' keyword.
 
     """
-    for idx, instr in enumerate(code):
+    for instr in code:
         if (getattr(instr, "name", None) == "LOAD_GLOBAL" and
                 instr.arg not in global_vars):
             instr.name = "LOAD_NAME"
@@ -450,9 +503,10 @@ def run_in_dynamic_scope(code, global_vars):
     fetch_helpers(cg)
 
     # Scan all ops to detect function call after GET_ITER
+    append_op = cg.code_ops.append
     for instr in code:
         if not isinstance(instr, bc.Instr):
-            cg.code_ops.append(instr)
+            append_op(instr)
             continue
         i_name, i_arg = instr.name, instr.arg
         if isinstance(i_arg, CodeType):
@@ -467,15 +521,15 @@ def run_in_dynamic_scope(code, global_vars):
             run_in_dynamic_scope(inner, global_vars)
             inner.update_flags()
             i_arg = inner.to_code()
-        elif any(i_name == make_fun_op for make_fun_op in _MAKE_FUNC):
-            cg.code_ops.append(bc.Instr(i_name, i_arg))  # func
+        elif i_name in _MAKE_FUNC:
+            append_op(bc.Instr(i_name, i_arg))           # func
             load_helper(cg, 'wrap_func')                 # func -> wrap
             cg.rot_two()                                 # wrap -> func
             cg.load_global('__scope__')                  # wrap -> func -> scope
             cg.call_function(2)                          # wrapped
             continue
 
-        cg.code_ops.append(bc.Instr(i_name, i_arg))
+        append_op(bc.Instr(i_name, i_arg))
 
     del code[:]
     code.extend(cg.code_ops)
@@ -483,6 +537,88 @@ def run_in_dynamic_scope(code, global_vars):
     code.update_flags()
 
 
+#: The placeholder for the class name in the class body template.
+_CLASS_NAME = '_[class_name]'
+
+
+@lru_cache(maxsize=None)
+def _class_body_template():
+    """ Get the template code object for a child def class body.
+
+    The body sets the __module__ and __qualname__ of the class. The
+    class name is stored as the '_CLASS_NAME' placeholder const, to be
+    replaced along with the name, filename, and first line number of
+    the code object by 'gen_child_def_subclass'.
+
+    Returns
+    -------
+    result : tuple
+        A 2-tuple of (code, index) where code is the template code
+        object and index is the position of the placeholder const.
+
+    """
+    class_cg = CodeGenerator()
+    class_cg.name = _CLASS_NAME
+    class_cg.firstlineno = 1
+    class_cg.set_lineno(1)
+
+    class_cg.load_name('__name__')
+    class_cg.store_name('__module__')
+    class_cg.load_const(_CLASS_NAME)
+    class_cg.store_name('__qualname__')
+    class_cg.load_const(None)
+    class_cg.return_value()
+
+    code = class_cg.to_code()
+    return code, code.co_consts.index(_CLASS_NAME)
+
+
+def gen_child_def_subclass(cg, node):
+    """ Generate the code to subclass the child type on the TOS.
+
+    The child type on the TOS is replaced by the new subclass. This is
+    only needed for child defs which declare storage, alias, or func
+    members of their own.
+
+    Parameters
+    ----------
+    cg : CodeGenerator
+        The code generator with which to write the code.
+
+    node : ChildDef
+        The enaml ast node of interest.
+
+    """
+    # Create the class code
+    cg.load_build_class()
+    cg.rot_two()                                # builtins.__build_class_ -> base
+
+    # Specialize the class body template for this child def. The line
+    # table is relative to the first line number and carries over as is.
+    template, index = _class_body_template()
+    consts = list(template.co_consts)
+    consts[index] = node.typename
+    replacements = dict(
+        co_name=node.typename,
+        co_filename=cg.filename,
+        co_firstlineno=node.lineno,
+        co_consts=tuple(consts),
+    )
+    # Python 3.11+ code objects also carry a qualified name which would
+    # otherwise keep the placeholder.
+    if hasattr(template, 'co_qualname'):
+        replacements['co_qualname'] = node.typename
+    class_code = template.replace(**replacements)
+    cg.load_const(class_code)
+    cg.load_const(None)  # XXX better qualified name
+    cg.make_function()
+
+    cg.rot_two()                                # builtins.__build_class_ -> class_func -> base
+    cg.load_const(node.typename)
+    cg.rot_two()                                # builtins.__build_class_ -> class_func -> class_name -> base
+    cg.call_function(3)                         # class
+
+
 def gen_child_def_node(cg, node, local_names):
     """ Generate the code to create the child def compiler node.
 
@@ -503,43 +639,11 @@ def gen_child_def_node(cg, node, local_names):
     """
     # Validate the type of the child
     load_name(cg, node.typename, local_names)
-    with cg.try_squash_raise():
-        cg.dup_top()
-        load_helper(cg, 'validate_declarative')
-        cg.rot_two()                            # base -> helper -> base
-        cg.call_function(1)                     # base -> retval
-        cg.pop_top()                            # base
+    validate_tos(cg, 'validate_declarative')
 
     # Subclass the child class if needed
-    store_types = (StorageExpr, AliasExpr, FuncDef)
-    if any(isinstance(item, store_types) for item in node.body):
-
-        # Create the class code
-        cg.load_build_class()
-        cg.rot_two()                            # builtins.__build_class_ -> base
-
-        class_cg = CodeGenerator()
-        class_cg.filename = cg.filename
-        class_cg.name = node.typename
-        class_cg.firstlineno = node.lineno
-        class_cg.set_lineno(node.lineno)
-
-        class_cg.load_name('__name__')
-        class_cg.store_name('__module__')
-        class_cg.load_const(node.typename)
-        class_cg.store_name('__qualname__')
-        class_cg.load_const(None)
-        class_cg.return_value()
-
-        class_code = class_cg.to_code()
-        cg.load_const(class_code)
-        cg.load_const(None)  # XXX better qualified name
-        cg.make_function()
-
-        cg.rot_two()                            # builtins.__build_class_ -> class_func -> base
-        cg.load_const(node.typename)
-        cg.rot_two()                            # builtins.__build_class_ -> class_func -> class_name -> base
-        cg.call_function(3)                     # class
+    if should_subclass(node):
+        gen_child_def_subclass(cg, node)
 
     # Build the declarative compiler node
     store_locals = should_store_locals(node)
@@ -571,12 +675,7 @@ def gen_template_inst_node(cg, node, local_names):
     """
     # Validate the type of the template.
     load_name(cg, node.name, local_names)
-    with cg.try_squash_raise():
-        cg.dup_top()
-        load_helper(cg, 'validate_template')
-        cg.rot_two()
-        cg.call_function(1)
-        cg.pop_top()
+    validate_tos(cg, 'validate_template')
 
     # Load the arguments for the instantiation call.
     arguments = node.arguments
@@ -601,14 +700,9 @@ def gen_template_inst_node(cg, node, local_names):
     if identifiers is not None:
         names = tuple(identifiers.names)
         starname = identifiers.starname
-        with cg.try_squash_raise():
-            cg.dup_top()
-            load_helper(cg, 'validate_unpack_size')
-            cg.rot_two()
-            cg.load_const(len(names))
-            cg.load_const(bool(starname))
-            cg.call_function(3)
-            cg.pop_top()
+        validate_tos(
+            cg, 'validate_unpack_size', (len(names), bool(starname))
+        )
 
     # Load and call the helper to create the compiler node
     load_helper(cg, 'template_inst_node')
@@ -642,13 +736,14 @@ def sanitize_operator_code(filename, mode, ast):
     """
     global_vars, has_defs = analyse_globals_and_func_defs(ast)
     # In mode exec, the body of the operator has been wrapped in a function def
-    # after the compilation we extract the function code
+    # after the compilation we extract the function code. The wrapper module
+    # only holds that definition so the code can be read from the module
+    # constants without disassembling the module bytecode.
     code = compile(ast, filename, mode=mode)
     if mode == 'exec':
-        for instr in bc.Bytecode.from_code(code):
-            i_arg = instr.arg
-            if isinstance(i_arg, CodeType):
-                code = i_arg
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                code = const
                 break
 
     b_code = bc.Bytecode.from_code(code)
@@ -7,7 +7,9 @@
 #------------------------------------------------------------------------------
 import ast
 import sys
-from atom.api import Atom, Bool, Enum, Int, List, Str, Instance, Tuple, Typed
+from atom.api import (
+    Atom, Bool, Enum, Int, List, Str, Instance, Tuple, Typed, Value
+)
 
 
 class ASTNode(Atom):
@@ -318,12 +320,17 @@ class TemplateInstBinding(ASTNode):
     expr = Typed(OperatorExpr)
 
 
+#: A cache mapping node type to the name of its visitor method.
+_visitor_names = {}
+
+
 class ASTVisitor(Atom):
     """ A base class for creating AST visitors.
 
     """
-    #: An internal stack of the nodes being visited.
-    _node_stack = List()
+    #: An internal stack of the nodes being visited. This is a plain list
+    #: since it is accessed on every visit and never needs validation.
+    _node_stack = Value(factory=list)
 
     def visit(self, node, *args, **kwargs):
         """ The main visitor dispatch method.
@@ -331,7 +338,8 @@ class ASTVisitor(Atom):
         This method will dispatch to a method which has a name which
         matches the pattern visit_<type> where <type> is the name of
         the type of the node. If no visitor method for the node exists,
-        the 'default_visit' method will be invoked.
+        the 'default_visit' method will be invoked. The visitor method
+        name is cached for each node type.
 
         Parameters
         ----------
@@ -350,15 +358,20 @@ class ASTVisitor(Atom):
             The object returned by the visitor, if any.
 
         """
-        name = 'visit_' + type(node).__name__
+        node_type = type(node)
+        try:
+            name = _visitor_names[node_type]
+        except KeyError:
+            name = _visitor_names[node_type] = 'visit_' + node_type.__name__
         visitor = getattr(self, name, None)
         if visitor is None:
             visitor = self.default_visit
-        self._node_stack.append(node)
+        stack = self._node_stack
+        stack.append(node)
         try:
             result = visitor(node, *args, **kwargs)
         finally:
-            self._node_stack.pop()
+            stack.pop()
         return result
 
     def default_visit(self, node, *args, **kwargs):
@@ -8,7 +8,6 @@
 from . import block_compiler as block
 from . import compiler_common as cmn
 from .enaml_ast import EnamlDef
-from ..compat import POS_ONLY_ARGS
 
 
 class FirstPassEnamlDefCompiler(block.FirstPassBlockCompiler):
@@ -64,19 +63,14 @@ class FirstPassEnamlDefCompiler(block.FirstPassBlockCompiler):
         cg.args = args
         code = cg.to_code()
 
-        # Union the two index maps for use by the second compiler pass.
-        final_index_map = dict(compiler.index_map)
-        final_index_map.update(compiler.aux_index_map)
-
-        return (code, final_index_map)
+        return (code, compiler.index_map)
 
     def visit_EnamlDef(self, node):
         # No pragmas are supported yet for template nodes.
         cmn.warn_pragmas(node, self.filename)
 
         # Claim the index for the compiler node
-        index = len(self.index_map)
-        self.index_map[node] = index
+        index = self.claim_index(node)
 
         cg = self.code_generator
         cg.set_lineno(node.lineno)
@@ -89,31 +83,16 @@ class FirstPassEnamlDefCompiler(block.FirstPassBlockCompiler):
         cg.load_global(node.base)                   # helper -> name -> base
 
         # Validate the type of the base class
-        with cg.try_squash_raise():
-            cg.dup_top()
-            cmn.load_helper(cg, 'validate_declarative')
-            cg.rot_two()                            # helper -> name -> base -> helper -> base
-            cg.call_function(1)                     # helper -> name -> base -> retval
-            cg.pop_top()                            # helper -> name -> base
+        cmn.validate_tos(cg, 'validate_declarative')  # helper -> name -> base
 
         # Build the enamldef class
         cg.build_tuple(1)
-        cg.build_map()
-        if POS_ONLY_ARGS:
-            cg.load_const('__module__')
-            cg.load_global('__name__')
-        else:
-            cg.load_global('__name__')
-            cg.load_const('__module__')
-        cg.add_map()                               # helper -> name -> bases -> dict
+        cg.load_global('__name__')
+        keys = ('__module__',)
         if node.docstring:
-            if POS_ONLY_ARGS:
-                cg.load_const('__doc__')
-                cg.load_const(node.docstring)
-            else:
-                cg.load_const(node.docstring)
-                cg.load_const('__doc__')
-            cg.add_map()
+            cg.load_const(node.docstring)
+            keys += ('__doc__',)
+        cg.build_const_key_map(keys)                # helper -> name -> bases -> dict
         cg.call_function(3)                         # class
 
         # Build the compiler node
@@ -130,7 +109,7 @@ class FirstPassEnamlDefCompiler(block.FirstPassBlockCompiler):
 
         # Visit the body of the enamldef
         for item in node.body:
-            self.visit(item)
+            self.visit(item, index)
 
         # Update the internal node ids for the hierarchy.
         cmn.load_node(cg, 0)
@@ -102,19 +102,14 @@ class FirstPassTemplateCompiler(block.FirstPassBlockCompiler):
         cg.args = args
         code = cg.to_code()
 
-        # Union the two index maps for use by the second compiler pass.
-        final_index_map = dict(compiler.index_map)
-        final_index_map.update(compiler.aux_index_map)
-
-        return (code, final_index_map)
+        return (code, compiler.index_map)
 
     def visit_Template(self, node):
         # No pragmas are supported yet for template nodes.
         cmn.warn_pragmas(node, self.filename)
 
         # Claim the index for the compiler node
-        index = len(self.index_map)
-        self.index_map[node] = index
+        index = self.claim_index(node)
 
         # Setup the line number for the template.
         cg = self.code_generator
@@ -128,7 +123,7 @@ class FirstPassTemplateCompiler(block.FirstPassBlockCompiler):
 
         # Visit the body of the template.
         for item in node.body:
-            self.visit(item)
+            self.visit(item, index)
 
         # Update the internal node ids for the hierarchy.
         cmn.load_node(cg, 0)
@@ -148,7 +143,7 @@ class FirstPassTemplateCompiler(block.FirstPassBlockCompiler):
         cg.build_tuple(2)
         cg.return_value()
 
-    def visit_ConstExpr(self, node):
+    def visit_ConstExpr(self, node, parent):
         # Keep track of the const name for loading for return.
         self.const_names.append(node.name)
 
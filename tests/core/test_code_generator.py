@@ -27,3 +27,27 @@ def test_python_block_insertion(source, return_on_lines):
         if getattr(i, "name", "") == "RETURN_VALUE":
             assert i.lineno in return_on_lines
     cg.to_code()
+
+
+def test_python_expr_insertion_with_local_names():
+    """Test rewriting the names of an inserted expression."""
+    cg = CodeGenerator()
+    cg.load_name("c")
+    cg.insert_python_expr(ast.parse("a + b", mode="eval"), local_names={"a"})
+    names = [(i.name, i.arg) for i in cg.code_ops]
+    assert names[0] == ("LOAD_NAME", "c")
+    assert ("LOAD_FAST", "a") in names
+    assert ("LOAD_GLOBAL", "b") in names
+    # Only the inserted code is rewritten.
+    assert cg.args == []
+    assert not cg.newlocals
+
+
+def test_build_const_key_map():
+    """Test building a map from constant keys."""
+    cg = CodeGenerator()
+    cg.load_const(1)
+    cg.load_const(2)
+    cg.build_const_key_map(("a", "b"))
+    cg.return_value()
+    assert eval(cg.to_code()) == {"a": 1, "b": 2}
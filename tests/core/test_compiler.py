@@ -10,6 +10,8 @@ from textwrap import dedent
 
 import pytest
 
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.core.parser import parse
 from utils import compile_source
 
 
@@ -60,4 +62,38 @@ def test_validate_declarative_2():
     assert " validate_declarative" not in ftb
 
 
+def test_child_def_subclass():
+    """ Test the class created for a child def declaring new members.
+
+    """
+    source = dedent("""\
+    from enaml.core.declarative import Declarative
+
+    enamldef Main(Declarative):
+        Declarative: child:
+            attr value = 1
+
+    """)
+    code = EnamlCompiler.compile(parse(source, '<test>'), '<test>')
+
+    def iter_codes(code):
+        yield code
+        for const in code.co_consts:
+            if isinstance(const, type(code)):
+                yield from iter_codes(const)
+
+    class_codes = [c for c in iter_codes(code) if c.co_name == 'Declarative']
+    assert len(class_codes) == 1
+    assert class_codes[0].co_firstlineno == 4
+    assert class_codes[0].co_filename == '<test>'
+
+    namespace = {'__name__': 'test_module'}
+    exec(code, namespace)
+    child = namespace['Main']().children[0]
+    assert type(child).__qualname__ == 'Declarative'
+    assert type(child).__module__ == 'test_module'
+    assert type(child) is not namespace['Declarative']
+    assert child.value == 1
+
+
 # XXX add test regarding handling of with statement
@@ -0,0 +1,76 @@
+#------------------------------------------------------------------------------
+# Copyright (c) 2022, Nucleic Development Team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Test for the enaml ast visitor."""
+import pytest
+
+from enaml.core.enaml_ast import (
+    ASTVisitor, Binding, ChildDef, StorageExpr, TemplateIdentifiers
+)
+
+
+class NodeVisitor(ASTVisitor):
+
+    def visit_ChildDef(self, node):
+        return [self.visit(item) for item in node.body]
+
+    def visit_Binding(self, node):
+        return self.ancestor()
+
+
+class SubNodeVisitor(NodeVisitor):
+
+    def visit_Binding(self, node):
+        return 'binding'
+
+
+def test_visitor_dispatch():
+    """Test that the visitor dispatches on the node and visitor types."""
+    binding = Binding()
+    child = ChildDef(body=[binding])
+    assert NodeVisitor().visit(child) == [child]
+    assert SubNodeVisitor().visit(child) == ['binding']
+    assert NodeVisitor().visit(binding) is None
+
+
+def test_visitor_default_visit():
+    """Test that visiting a node without visitor raises a TypeError."""
+    with pytest.raises(TypeError) as excinfo:
+        NodeVisitor().visit(StorageExpr())
+    assert 'StorageExpr' in str(excinfo.value)
+
+
+def test_visitor_override_after_visit(monkeypatch):
+    """Test that replacing a visitor method after a visit is honored."""
+    child = ChildDef()
+    assert NodeVisitor().visit(child) == []
+    monkeypatch.setattr(NodeVisitor, 'visit_ChildDef', lambda self, n: 'new')
+    assert NodeVisitor().visit(child) == 'new'
+
+
+def test_visitor_classmethod():
+    """Test that classmethod and staticmethod visitors are supported."""
+
+    class MethodVisitor(ASTVisitor):
+
+        @classmethod
+        def visit_Binding(cls, node):
+            return cls
+
+        @staticmethod
+        def visit_ChildDef(node):
+            return node
+
+    child = ChildDef()
+    assert MethodVisitor().visit(Binding()) is MethodVisitor
+    assert MethodVisitor().visit(child) is child
+
+
+def test_template_identifiers_names_list():
+    """Test that template identifier names accept a list."""
+    node = TemplateIdentifiers(names=['a', 'b'])
+    assert node.names == ['a', 'b']